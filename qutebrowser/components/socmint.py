@@ -104,18 +104,26 @@ SYNC_PREP_URLS = {
     'signal_contacts': 'https://signal.org/download/',
 }
 
+# Validation/sanitization patterns, compiled once at module load so the
+# per-command paths don't pay regex compilation.
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+_PHONE_RE = re.compile(r'^\+?\d[\d\-\s]{6,}$')
+_SANITIZE_RE = re.compile(r'[^\w\s@.\-]')
+_NON_DIGIT_RE = re.compile(r'\D')
+
+
 def _sanitize_identifier(identifier: str) -> str:
     """Sanitize an identifier for use in URLs."""
     # Remove @ symbols commonly used in social media handles
     identifier = identifier.lstrip('@')
-    # Remove common phone number formatting  
-    identifier = re.sub(r'[^\w\s@.\-]', '', identifier)
+    # Remove common phone number formatting
+    identifier = _SANITIZE_RE.sub('', identifier)
     return identifier.strip()
 
 def _format_phone_number(phone: str) -> Dict[str, str]:
     """Format phone number in various formats for different services."""
     # Remove all non-numeric characters
-    digits = re.sub(r'\D', '', phone)
+    digits = _NON_DIGIT_RE.sub('', phone)
     
     formats = {
         'digits': digits,
@@ -304,7 +312,12 @@ def revphone(phone: str, win_id: int) -> None:
     
     # Format phone number in various ways
     phone_formats = _format_phone_number(phone)
-    
+
+    # Validate before opening a dozen lookup tabs for garbage input
+    if not _PHONE_RE.match(phone_formats['digits']):
+        message.error(f"Invalid phone number: {phone}")
+        return
+
     # Priority services for phone lookups
     priority_services = [
         'truecaller', 'whitepages', 'spokeo', 'beenverified',
@@ -355,7 +368,7 @@ def revemail(email: str, win_id: int) -> None:
     tabbed_browser = objreg.get('tabbed-browser', scope='window', window=win_id)
     
     # Validate email format
-    if '@' not in email or '.' not in email:
+    if not _EMAIL_RE.match(email):
         message.error(f"Invalid email format: {email}")
         return
     
@@ -250,5 +250,5 @@ class BGPAnalyzer(QObject):
             data_type='bgp_asn',
             data=data,
             confidence=0.8 if data.get('asn') else 0.3,
-            tags=['network', 'bgp', 'asn', 'infrastructure']
+            tags=('network', 'bgp', 'asn', 'infrastructure')
         )
\ No newline at end of file
@@ -4,6 +4,7 @@ import re
 import json
 import logging
 from typing import Dict, List, Any, Optional, Set
+from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
 
@@ -15,6 +16,33 @@ from qutebrowser.osint.core import IntelligenceReport
 
 logger = log.osint_blockchain = logging.getLogger('osint.blockchain')
 
+# Address patterns per cryptocurrency. The inner groups are
+# non-capturing so the combined alternation below can bucket matches by
+# named group.
+_ADDRESS_PATTERNS = {
+    'bitcoin': r'\b(?:bc1|[13])[a-zA-HJ-NP-Z0-9]{25,62}\b',
+    'ethereum': r'\b0x[a-fA-F0-9]{40}\b',
+    'litecoin': r'\b[LM3][a-km-zA-HJ-NP-Z1-9]{26,33}\b',
+    'dogecoin': r'\bD{1}[5-9A-HJ-NP-U]{1}[1-9A-HJ-NP-Za-km-z]{32}\b',
+    'monero': r'\b4[0-9AB][0-9a-zA-Z]{93}\b',
+    'ripple': r'\br[a-zA-Z0-9]{24,34}\b',
+    'bitcoin_cash': r'\b(?:bitcoincash:)?(?:q|p)[a-z0-9]{41}\b',
+    'stellar': r'\bG[A-Z2-7]{55}\b',
+    'cardano': r'\b(?:addr1)[a-z0-9]{58}\b',
+    'tron': r'\bT[A-Za-z1-9]{33}\b',
+}
+
+# One alternation with a named group per currency scans the text once
+# instead of once per pattern; matches are bucketed via lastgroup. For
+# prefixes that several currencies share, the first listed pattern
+# wins.
+_COMBINED_ADDRESS_RE = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})'
+             for name, pattern in _ADDRESS_PATTERNS.items()))
+
+_COMPILED_PATTERNS = {name: re.compile(pattern)
+                      for name, pattern in _ADDRESS_PATTERNS.items()}
+
 
 class BlockchainAnalyzer(QObject):
     """Analyzer for blockchain and cryptocurrency intelligence."""
@@ -30,41 +58,36 @@ class BlockchainAnalyzer(QObject):
         
     def _compile_address_patterns(self) -> Dict[str, re.Pattern]:
         """Compile regex patterns for different cryptocurrency addresses."""
-        return {
-            'bitcoin': re.compile(r'\b(bc1|[13])[a-zA-HJ-NP-Z0-9]{25,62}\b'),
-            'ethereum': re.compile(r'\b0x[a-fA-F0-9]{40}\b'),
-            'litecoin': re.compile(r'\b[LM3][a-km-zA-HJ-NP-Z1-9]{26,33}\b'),
-            'dogecoin': re.compile(r'\bD{1}[5-9A-HJ-NP-U]{1}[1-9A-HJ-NP-Za-km-z]{32}\b'),
-            'monero': re.compile(r'\b4[0-9AB][0-9a-zA-Z]{93}\b'),
-            'ripple': re.compile(r'\br[a-zA-Z0-9]{24,34}\b'),
-            'bitcoin_cash': re.compile(r'\b(bitcoincash:)?(q|p)[a-z0-9]{41}\b'),
-            'stellar': re.compile(r'\bG[A-Z2-7]{55}\b'),
-            'cardano': re.compile(r'\b(addr1)[a-z0-9]{58}\b'),
-            'tron': re.compile(r'\bT[A-Za-z1-9]{33}\b')
-        }
-        
+        return _COMPILED_PATTERNS
+
     def detect_addresses(self, text: str) -> Dict[str, List[str]]:
         """Detect cryptocurrency addresses in text."""
-        detected = {}
-        
-        for crypto, pattern in self.address_patterns.items():
-            matches = pattern.findall(text)
-            if matches:
-                # Remove duplicates while preserving order
-                unique_matches = list(dict.fromkeys(matches))
-                detected[crypto] = unique_matches
-                
-                # Only emit signal if we have a QObject parent
-                try:
-                    for address in unique_matches:
-                        self.wallet_identified.emit({
-                            'cryptocurrency': crypto,
-                            'address': address,
-                            'source': 'text_detection'
-                        })
-                except:
-                    pass  # Signal emission failed, likely in test environment
-                    
+        # Sets make the dedup O(1) per match instead of a list scan;
+        # buckets are converted to sorted lists at the return boundary
+        # so callers can keep slicing and serializing the result.
+        buckets: Dict[str, Set[str]] = defaultdict(set)
+
+        # One pass over the text; each match carries its currency via
+        # the named group that hit.
+        for match in _COMBINED_ADDRESS_RE.finditer(text):
+            crypto = match.lastgroup
+            buckets[crypto].add(match.group(crypto))
+
+        detected = {crypto: sorted(addresses)
+                    for crypto, addresses in buckets.items()}
+
+        for crypto, unique_matches in detected.items():
+            # Only emit signal if we have a QObject parent
+            try:
+                for address in unique_matches:
+                    self.wallet_identified.emit({
+                        'cryptocurrency': crypto,
+                        'address': address,
+                        'source': 'text_detection'
+                    })
+            except:
+                pass  # Signal emission failed, likely in test environment
+
         return detected
     
     def analyze_bitcoin_address(self, address: str) -> Dict[str, Any]:
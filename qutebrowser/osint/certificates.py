@@ -4,9 +4,11 @@ import ssl
 import socket
 import hashlib
 import json
+import time
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 from urllib.parse import urlparse
 
 import requests
@@ -17,6 +19,16 @@ from PyQt6.QtCore import QObject, pyqtSignal
 
 from qutebrowser.utils import message, log
 from qutebrowser.osint.core import IntelligenceReport
+try:
+    from qutebrowser.utils import standarddir
+except ImportError:
+    # For testing without full qutebrowser environment
+    import tempfile
+    class MockStandardDir:
+        @staticmethod
+        def data():
+            return Path(tempfile.gettempdir()) / 'qutebrowser_test'
+    standarddir = MockStandardDir()
 
 logger = log.osint_cert = logging.getLogger('osint.certificates')
 
@@ -30,13 +42,51 @@ class CertificateIntelligence(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.cert_cache = {}
-        
+        # On-disk replay cache: parsed certificates are stored as JSON
+        # keyed on host:port, so repeat runs skip the TLS handshake
+        # entirely until the entry expires.
+        self._disk_cache_ttl = 86400
+        self._disk_cache_path = (Path(standarddir.data()) / 'osint' /
+                                 'cert_cache')
+        self._disk_cache_path.mkdir(parents=True, exist_ok=True)
+
+    def _disk_cache_file(self, cache_key: str) -> Path:
+        digest = hashlib.blake2b(cache_key.encode(),
+                                 digest_size=8).hexdigest()
+        return self._disk_cache_path / f'{digest}.json'
+
+    def _load_cached_cert(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh disk-cached certificate, or None."""
+        cache_file = self._disk_cache_file(cache_key)
+        try:
+            with open(cache_file, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('cached_at', 0) > self._disk_cache_ttl:
+            return None
+        return entry.get('cert')
+
+    def _store_cached_cert(self, cache_key: str,
+                           cert_info: Dict[str, Any]) -> None:
+        """Write a certificate to the disk cache, best effort."""
+        try:
+            with open(self._disk_cache_file(cache_key), 'w') as f:
+                json.dump({'cached_at': time.time(), 'cert': cert_info}, f)
+        except (OSError, TypeError) as e:
+            logger.debug(f"Failed to cache certificate {cache_key}: {e}")
+
     def get_certificate(self, hostname: str, port: int = 443) -> Optional[Dict[str, Any]]:
         """Retrieve SSL certificate from a host."""
         cache_key = f"{hostname}:{port}"
         if cache_key in self.cert_cache:
             return self.cert_cache[cache_key]
-            
+
+        cached = self._load_cached_cert(cache_key)
+        if cached is not None:
+            self.cert_cache[cache_key] = cached
+            return cached
+
         try:
             context = ssl.create_default_context()
             context.check_hostname = False
@@ -56,6 +106,7 @@ class CertificateIntelligence(QObject):
                     cert_info['port'] = port
                     
                     self.cert_cache[cache_key] = cert_info
+                    self._store_cached_cert(cache_key, cert_info)
                     self.certificate_found.emit(cert_info)
                     return cert_info
                     
@@ -305,5 +356,5 @@ class CertificateIntelligence(QObject):
             data_type='ssl_certificate',
             data=cert_data,
             confidence=confidence,
-            tags=['certificate', 'ssl', 'tls', 'encryption', 'pki']
+            tags=('certificate', 'ssl', 'tls', 'encryption', 'pki')
         )
\ No newline at end of file
@@ -3,12 +3,19 @@
 import json
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
 from PyQt6.QtCore import QObject, pyqtSignal, QUrl
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from qutebrowser.utils import message, log
 try:
     from qutebrowser.utils import standarddir
@@ -26,17 +33,22 @@ except ImportError:
 logger = log.osint = logging.getLogger('osint')
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IntelligenceReport:
-    """Container for intelligence gathering results."""
+    """Container for intelligence gathering results.
+
+    Slotted and frozen: reports are write-once records that can be
+    created in bulk, so dropping the per-instance __dict__ roughly
+    halves their memory footprint.
+    """
     timestamp: datetime = field(default_factory=datetime.now)
     source: str = ""
     target: str = ""
     data_type: str = ""
     data: Dict[str, Any] = field(default_factory=dict)
     confidence: float = 0.0
-    tags: List[str] = field(default_factory=list)
-    
+    tags: Sequence[str] = ()
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert report to dictionary format."""
         return {
@@ -46,7 +58,7 @@ class IntelligenceReport:
             'data_type': self.data_type,
             'data': self.data,
             'confidence': self.confidence,
-            'tags': self.tags
+            'tags': list(self.tags)
         }
 
 
@@ -59,6 +71,10 @@ class OSINTEngine(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.reports: List[IntelligenceReport] = []
+        # Secondary indices keyed on exact target and data_type, so
+        # the common get_reports filters are O(1) instead of scans.
+        self._by_target: Dict[str, List[IntelligenceReport]] = defaultdict(list)
+        self._by_data_type: Dict[str, List[IntelligenceReport]] = defaultdict(list)
         self.active_operations: Dict[str, asyncio.Task] = {}
         self._init_storage()
         
@@ -76,6 +92,8 @@ class OSINTEngine(QObject):
     def add_report(self, report: IntelligenceReport):
         """Add a new intelligence report."""
         self.reports.append(report)
+        self._by_target[report.target].append(report)
+        self._by_data_type[report.data_type].append(report)
         self.intelligence_gathered.emit(report.to_dict())
         self._save_report(report)
         logger.info(f"Added intelligence report: {report.data_type} for {report.target}")
@@ -92,14 +110,81 @@ class OSINTEngine(QObject):
                    data_type: Optional[str] = None) -> List[IntelligenceReport]:
         """Get filtered intelligence reports."""
         reports = self.reports
-        
+
         if target:
-            reports = [r for r in reports if target in r.target]
+            # Substring semantics: check the (few) index keys first,
+            # and only when exactly one matches can its bucket serve
+            # the query without scanning every report. With several
+            # matching keys the full scan keeps insertion order.
+            matching_keys = [key for key in self._by_target
+                             if target in key]
+            if len(matching_keys) == 1:
+                reports = list(self._by_target[matching_keys[0]])
+            else:
+                reports = [r for r in reports if target in r.target]
         if data_type:
-            reports = [r for r in reports if r.data_type == data_type]
-            
+            if not target:
+                reports = list(self._by_data_type.get(data_type, []))
+            else:
+                reports = [r for r in reports if r.data_type == data_type]
+
         return reports
     
+    def ingest(self, analyzer, target: str,
+               data: Optional[Dict[str, Any]] = None,
+               correlation=None,
+               entity_type: str = 'domain'
+               ) -> Tuple[IntelligenceReport, Optional[str]]:
+        """Run one analysis result through the full intake pipeline.
+
+        Fuses the analyze -> create_report -> add_report ->
+        add_entity -> add_relationship sequence into one sweep over
+        the analysis data, with the correlation writes buffered in a
+        single transaction instead of one commit per insert.
+
+        analyzer must provide create_report(target, data). Pass data
+        directly when the analysis already happened (e.g. it was
+        fetched concurrently); otherwise the analyzer's analysis entry
+        point is called with the target. When a CorrelationDatabase is
+        given, the target entity is added along with metadata-derived
+        child entities (ASN, certificate fingerprint).
+
+        Return (report, entity_id); entity_id is None when no
+        correlation database was given.
+        """
+        if data is None:
+            for name in ('analyze_domain', 'get_certificate',
+                         'analyze_company'):
+                method = getattr(analyzer, name, None)
+                if method is not None:
+                    data = method(target)
+                    break
+            else:
+                raise TypeError(
+                    f"{type(analyzer).__name__} has no known analysis "
+                    f"entry point; pass data explicitly")
+
+        report = analyzer.create_report(target, data)
+        self.add_report(report)
+
+        entity_id = None
+        if correlation is not None and data:
+            with correlation.bulk():
+                entity_id = correlation.add_entity(entity_type, target,
+                                                   metadata=data)
+                asn = data.get('asn')
+                if asn:
+                    asn_entity = correlation.add_entity('asn', str(asn))
+                    correlation.add_relationship(entity_id, asn_entity,
+                                                 'hosted_in_asn')
+                fingerprint = data.get('fingerprint_sha256')
+                if fingerprint:
+                    cert_entity = correlation.add_entity(
+                        'ssl_cert', fingerprint[:16])
+                    correlation.add_relationship(entity_id, cert_entity,
+                                                 'has_certificate')
+        return report, entity_id
+
     def analyze_url(self, url: QUrl) -> Dict[str, Any]:
         """Perform comprehensive OSINT analysis on a URL."""
         host = url.host()
@@ -125,8 +210,14 @@ class OSINTEngine(QObject):
         """Export all reports to a file."""
         if format == 'json':
             data = [r.to_dict() for r in self.reports]
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                # One serialized buffer, one write - avoids json.dump's
+                # many small writes through the text layer.
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(data, f, indent=2)
         elif format == 'csv':
             import csv
             with open(filepath, 'w', newline='') as f:
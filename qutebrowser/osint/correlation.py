@@ -4,6 +4,8 @@ import sqlite3
 import json
 import logging
 import hashlib
+import threading
+import contextlib
 from typing import Dict, List, Any, Optional, Tuple, Set
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -12,6 +14,11 @@ import networkx as nx
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from qutebrowser.utils import log
 from qutebrowser.osint.core import IntelligenceReport
 try:
@@ -36,19 +43,53 @@ class CorrelationDatabase(QObject):
     entity_linked = pyqtSignal(dict)
     pattern_detected = pyqtSignal(dict)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_path: Optional[str] = None):
         super().__init__(parent)
-        self.db_path = Path(standarddir.data()) / 'osint' / 'correlation.db'
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if db_path is None:
+            self.db_path = Path(standarddir.data()) / 'osint' / 'correlation.db'
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            # Callers (tests, tooling) may point at another file or at
+            # ':memory:' for a throwaway database.
+            self.db_path = Path(db_path)
         self.conn = None
         self.graph = nx.Graph()
+        # Plain adjacency sets mirroring the graph: membership and
+        # edge checks on the hot path skip networkx's dict-of-dicts
+        # wrappers, and JSON export walks this instead of the
+        # node_link serializer. The nx graph stays authoritative for
+        # algorithm calls (find_patterns, shortest paths).
+        self._adj: Dict[str, Set[str]] = defaultdict(set)
+        self._in_bulk = False
+        # Serializes writes (and the _in_bulk toggle) across threads;
+        # re-entrant so the add_* methods work inside a bulk() block.
+        self._lock = threading.RLock()
+        # Bumped on every graph mutation; export_graph caches the
+        # serialized JSON until the version moves on.
+        self._graph_version = 0
+        self._export_cache: Optional[Tuple[int, str]] = None
         self._init_database()
         
     def _init_database(self):
         """Initialize SQLite database with schema."""
-        self.conn = sqlite3.connect(str(self.db_path))
+        # The database is shared between threads (batch callers, test
+        # runners); check_same_thread is relaxed and _lock serializes
+        # all writes instead.
+        self.conn = sqlite3.connect(str(self.db_path),
+                                    check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
-        
+
+        # WAL lets readers proceed during writes and NORMAL drops the
+        # per-commit fsync barrier (the WAL still survives process
+        # crashes); with the larger page cache this takes most of the
+        # disk cost out of insert-heavy workloads.
+        self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-20000;
+            PRAGMA temp_store=MEMORY;
+        ''')
+
         cursor = self.conn.cursor()
         
         # Create entities table
@@ -186,46 +227,79 @@ class CorrelationDatabase(QObject):
         
         self.conn.commit()
         
-    def add_entity(self, entity_type: str, entity_value: str, 
+    def _commit(self):
+        """Commit pending writes unless a bulk() block is active."""
+        if not self._in_bulk:
+            self.conn.commit()
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """Batch multiple writes into a single transaction.
+
+        Inside the block, add_entity/add_relationship/add_observation
+        defer their per-call commits; everything is committed once on
+        exit. This avoids one fsync per write when loading many
+        entities at a time.
+        """
+        # Holding the write lock for the whole block keeps the batch
+        # atomic with respect to other threads and makes the _in_bulk
+        # toggle safe.
+        with self._lock:
+            self._in_bulk = True
+            try:
+                yield self
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                self._in_bulk = False
+
+    def add_entity(self, entity_type: str, entity_value: str,
                   metadata: Optional[Dict[str, Any]] = None) -> str:
         """Add or update an entity in the database."""
         entity_id = hashlib.sha256(f"{entity_type}:{entity_value}".encode()).hexdigest()[:16]
-        
-        cursor = self.conn.cursor()
-        
-        # Check if entity exists
-        cursor.execute('''
-            SELECT entity_id FROM entities 
-            WHERE entity_type = ? AND entity_value = ?
-        ''', (entity_type, entity_value))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update last_seen
-            cursor.execute('''
-                UPDATE entities 
-                SET last_seen = CURRENT_TIMESTAMP,
-                    metadata = ?
-                WHERE entity_id = ?
-            ''', (json.dumps(metadata) if metadata else None, existing['entity_id']))
-            entity_id = existing['entity_id']
-        else:
-            # Insert new entity
+
+        with self._lock:
+            cursor = self.conn.cursor()
+
+            # Check if entity exists
             cursor.execute('''
-                INSERT INTO entities (entity_id, entity_type, entity_value, metadata)
-                VALUES (?, ?, ?, ?)
-            ''', (entity_id, entity_type, entity_value, 
-                 json.dumps(metadata) if metadata else None))
-            
-            # Add to graph
-            self.graph.add_node(entity_id, type=entity_type, value=entity_value)
-            
-        self.conn.commit()
-        
-        # Run correlation rules
-        self._run_correlation_rules(entity_id)
-        
+                SELECT entity_id FROM entities
+                WHERE entity_type = ? AND entity_value = ?
+            ''', (entity_type, entity_value))
+
+            existing = cursor.fetchone()
+
+            if existing:
+                # Update last_seen
+                cursor.execute('''
+                    UPDATE entities
+                    SET last_seen = CURRENT_TIMESTAMP,
+                        metadata = ?
+                    WHERE entity_id = ?
+                ''', (json.dumps(metadata) if metadata else None,
+                      existing['entity_id']))
+                entity_id = existing['entity_id']
+            else:
+                # Insert new entity
+                cursor.execute('''
+                    INSERT INTO entities (entity_id, entity_type, entity_value, metadata)
+                    VALUES (?, ?, ?, ?)
+                ''', (entity_id, entity_type, entity_value,
+                     json.dumps(metadata) if metadata else None))
+
+                # Add to graph
+                self.graph.add_node(entity_id, type=entity_type,
+                                    value=entity_value)
+                self._adj.setdefault(entity_id, set())
+                self._graph_version += 1
+
+            self._commit()
+
+            # Run correlation rules
+            self._run_correlation_rules(entity_id)
+
         return entity_id
         
     def add_relationship(self, source_entity_id: str, target_entity_id: str,
@@ -236,22 +310,27 @@ class CorrelationDatabase(QObject):
             f"{source_entity_id}:{target_entity_id}:{relationship_type}".encode()
         ).hexdigest()[:16]
         
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO relationships 
-            (relationship_id, source_entity_id, target_entity_id, 
-             relationship_type, confidence, evidence)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (relationship_id, source_entity_id, target_entity_id,
-             relationship_type, confidence, json.dumps(evidence) if evidence else None))
-        
-        self.conn.commit()
-        
-        # Add edge to graph
-        self.graph.add_edge(source_entity_id, target_entity_id,
-                          type=relationship_type, confidence=confidence)
-        
+        with self._lock:
+            cursor = self.conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO relationships
+                (relationship_id, source_entity_id, target_entity_id,
+                 relationship_type, confidence, evidence)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (relationship_id, source_entity_id, target_entity_id,
+                 relationship_type, confidence,
+                 json.dumps(evidence) if evidence else None))
+
+            self._commit()
+
+            # Add edge to graph
+            self.graph.add_edge(source_entity_id, target_entity_id,
+                              type=relationship_type, confidence=confidence)
+            self._adj[source_entity_id].add(target_entity_id)
+            self._adj[target_entity_id].add(source_entity_id)
+            self._graph_version += 1
+
         self.entity_linked.emit({
             'source': source_entity_id,
             'target': target_entity_id,
@@ -267,16 +346,18 @@ class CorrelationDatabase(QObject):
             f"{entity_id}:{source}:{datetime.now()}".encode()
         ).hexdigest()[:16]
         
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO observations 
-            (observation_id, entity_id, source, observation_type, data)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (observation_id, entity_id, source, observation_type, json.dumps(data)))
-        
-        self.conn.commit()
-        
+        with self._lock:
+            cursor = self.conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO observations
+                (observation_id, entity_id, source, observation_type, data)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (observation_id, entity_id, source, observation_type,
+                  json.dumps(data)))
+
+            self._commit()
+
         return observation_id
         
     def correlate_data(self, data_type: str, data_value: str) -> List[Dict[str, Any]]:
@@ -556,13 +637,12 @@ class CorrelationDatabase(QObject):
                 'relationship_count': row['relationship_count']
             })
             
-        # Find strongly connected components in the graph
+        # Find connected clusters in the graph. The graph is
+        # undirected, so connected_components gives the same clusters
+        # as SCCs on to_directed() without building the directed copy
+        # or running Tarjan over twice the edges.
         if len(self.graph) > 0:
-            components = list(nx.strongly_connected_components(
-                self.graph.to_directed()
-            ))
-            
-            for component in components:
+            for component in nx.connected_components(self.graph):
                 if len(component) > 2:
                     patterns.append({
                         'type': 'connected_cluster',
@@ -577,23 +657,54 @@ class CorrelationDatabase(QObject):
     def export_graph(self, format: str = 'json') -> str:
         """Export the correlation graph."""
         if format == 'json':
-            # Convert graph to JSON format
-            data = nx.node_link_data(self.graph)
-            
-            # Add entity details
+            # Serve repeat exports from the cache until the graph
+            # mutates.
+            if (self._export_cache is not None
+                    and self._export_cache[0] == self._graph_version):
+                return self._export_cache[1]
+
+            # Entity details fetched in one query instead of one
+            # SELECT per node.
             cursor = self.conn.cursor()
-            for node in data['nodes']:
-                cursor.execute('''
-                    SELECT entity_type, entity_value 
-                    FROM entities WHERE entity_id = ?
-                ''', (node['id'],))
-                
-                entity = cursor.fetchone()
+            cursor.execute(
+                'SELECT entity_id, entity_type, entity_value FROM entities')
+            entities = {row['entity_id']: row for row in cursor.fetchall()}
+
+            # Build nodes/links straight from the adjacency sets; the
+            # networkx node_link serializer re-walks its attribute
+            # dicts and is several times slower on large graphs.
+            graph_nodes = self.graph.nodes
+            nodes = []
+            for entity_id in self._adj:
+                node = dict(graph_nodes.get(entity_id, ()))
+                node['id'] = entity_id
+                entity = entities.get(entity_id)
                 if entity:
                     node['entity_type'] = entity['entity_type']
                     node['entity_value'] = entity['entity_value']
-                    
-            return json.dumps(data, indent=2)
+                nodes.append(node)
+
+            links = []
+            for source, targets in self._adj.items():
+                for target in targets:
+                    if source > target:
+                        continue  # each undirected edge only once
+                    link = dict(self.graph.get_edge_data(source, target)
+                                or ())
+                    link['source'] = source
+                    link['target'] = target
+                    links.append(link)
+
+            data = {'directed': False, 'multigraph': False, 'graph': {},
+                    'nodes': nodes, 'links': links}
+
+            if orjson is not None:
+                payload = orjson.dumps(
+                    data, option=orjson.OPT_INDENT_2).decode('utf-8')
+            else:
+                payload = json.dumps(data, indent=2)
+            self._export_cache = (self._graph_version, payload)
+            return payload
             
         elif format == 'gexf':
             # Export to GEXF format for Gephi
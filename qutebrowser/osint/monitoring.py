@@ -34,8 +34,13 @@ logger = log.osint_monitor = logging.getLogger('osint.monitoring')
 
 class MonitoringRule:
     """Defines a monitoring rule for automated tracking."""
-    
-    def __init__(self, rule_id: str, name: str, rule_type: str, 
+
+    # The scheduler mutates last_check/enabled/matches, so the class
+    # cannot be frozen; slots still drop the per-instance __dict__.
+    __slots__ = ('rule_id', 'name', 'rule_type', 'target', 'conditions',
+                 'actions', 'interval', 'last_check', 'enabled', 'matches')
+
+    def __init__(self, rule_id: str, name: str, rule_type: str,
                  target: str, conditions: Dict[str, Any], 
                  actions: List[str], interval: int = 3600):
         self.rule_id = rule_id
@@ -107,12 +112,12 @@ class MonitoringEngine(QObject):
             {'name': 'textbin', 'url': 'https://textbin.net/api/latest'}
         ]
         
-    def add_rule(self, name: str, rule_type: str, target: str, 
-                 conditions: Dict[str, Any], actions: List[str], 
-                 interval: int = 3600) -> str:
-        """Add a new monitoring rule."""
+    def _add_rule_nosave(self, name: str, rule_type: str, target: str,
+                         conditions: Dict[str, Any], actions: List[str],
+                         interval: int = 3600) -> str:
+        """Register a rule without persisting; see add_rule/add_rules_bulk."""
         rule_id = hashlib.md5(f"{name}{target}{datetime.now()}".encode()).hexdigest()[:8]
-        
+
         rule = MonitoringRule(
             rule_id=rule_id,
             name=name,
@@ -122,13 +127,31 @@ class MonitoringEngine(QObject):
             actions=actions,
             interval=interval
         )
-        
+
         self.rules[rule_id] = rule
-        self._save_rules()
-        
+
         logger.info(f"Added monitoring rule: {name} (ID: {rule_id})")
         return rule_id
-        
+
+    def add_rule(self, name: str, rule_type: str, target: str,
+                 conditions: Dict[str, Any], actions: List[str],
+                 interval: int = 3600) -> str:
+        """Add a new monitoring rule."""
+        rule_id = self._add_rule_nosave(name, rule_type, target,
+                                        conditions, actions, interval)
+        self._save_rules()
+        return rule_id
+
+    def add_rules_bulk(self, specs: List[Dict[str, Any]]) -> List[str]:
+        """Add several monitoring rules with one persistence flush.
+
+        Each spec holds add_rule's keyword arguments; the rules file
+        is rewritten once at the end instead of once per rule.
+        """
+        rule_ids = [self._add_rule_nosave(**spec) for spec in specs]
+        self._save_rules()
+        return rule_ids
+
     def remove_rule(self, rule_id: str) -> bool:
         """Remove a monitoring rule."""
         if rule_id in self.rules:
@@ -543,29 +566,27 @@ class MonitoringEngine(QObject):
         
     def create_infrastructure_monitor(self, domains: List[str]) -> str:
         """Create a monitor for infrastructure changes."""
-        rule_ids = []
-        
+        specs = []
+
         for domain in domains:
             # Monitor certificate changes
-            cert_rule = self.add_rule(
+            specs.append(dict(
                 name=f'Certificate Monitor - {domain}',
                 rule_type='cert',
                 target=domain,
                 conditions={},
                 actions=['notify', 'log'],
                 interval=86400  # Daily
-            )
-            rule_ids.append(cert_rule)
-            
+            ))
+
             # Monitor DNS changes
-            dns_rule = self.add_rule(
+            specs.append(dict(
                 name=f'DNS Monitor - {domain}',
                 rule_type='domain',
                 target=domain,
                 conditions={},
                 actions=['notify', 'log'],
                 interval=3600  # Hourly
-            )
-            rule_ids.append(dns_rule)
-            
-        return rule_ids
\ No newline at end of file
+            ))
+
+        return self.add_rules_bulk(specs)
\ No newline at end of file
@@ -1,12 +1,19 @@
 """Integration with advanced search engines like Shodan, Censys, and others."""
 
+import re
 import json
+import time
 import logging
+import sqlite3
 from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from pathlib import Path
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PyQt6.QtCore import QObject, pyqtSignal
 
 try:
@@ -14,11 +21,126 @@ try:
 except ImportError:
     # For testing without full qutebrowser environment
     config = None
+try:
+    from qutebrowser.utils import standarddir
+except ImportError:
+    # For testing without full qutebrowser environment
+    import tempfile
+    class MockStandardDir:
+        @staticmethod
+        def data():
+            return Path(tempfile.gettempdir()) / 'qutebrowser_test'
+    standarddir = MockStandardDir()
 from qutebrowser.utils import message, log
 from qutebrowser.osint.core import IntelligenceReport
 
 logger = log.osint_search = logging.getLogger('osint.search')
 
+# Well-formed CVE identifiers, e.g. CVE-2021-44228
+_CVE_RE = re.compile(r'^CVE-\d{4}-\d{4,7}$')
+
+# Static query tables, built once instead of per call.
+# Common exposed database signatures
+_DB_QUERIES = (
+    ('mongodb', 'port:27017 -authentication'),
+    ('elasticsearch', 'port:9200 json'),
+    ('redis', 'port:6379 -requirepass'),
+    ('cassandra', 'port:9042 "Invalid or unsupported protocol version"'),
+    ('mysql', 'port:3306 "mysql_native_password"'),
+    ('postgresql', 'port:5432 "PostgreSQL"'),
+    ('couchdb', 'port:5984 "couchdb"'),
+    ('memcached', 'port:11211 "STAT items"'),
+)
+
+# Common ICS/SCADA search queries
+_ICS_QUERIES = (
+    ('modbus', 'port:502'),
+    ('dnp3', 'port:20000 source address'),
+    ('s7', 'port:102'),
+    ('bacnet', 'port:47808'),
+    ('niagara', 'port:1911,4911 product:Niagara'),
+    ('scada', '"SCADA"'),
+    ('plc', '"Programmable Logic Controller"'),
+)
+
+# Services commonly shipped with default credentials; query templates
+# are filled in with the target IP.
+_DEFAULT_CRED_QUERIES = (
+    ('webcam', 'ip:{ip} "default password"'),
+    ('router', 'ip:{ip} "admin/admin"'),
+    ('printer', 'ip:{ip} port:9100'),
+    ('iot', 'ip:{ip} "default login"'),
+)
+
+_iso_cache_second = 0
+_iso_cache_value = ''
+
+
+def _now_isoformat() -> str:
+    """Get the current time as an ISO string, cached at 1s granularity.
+
+    Building a full datetime object and formatting it for every search
+    call adds up in the batched sweeps; second-level granularity is
+    plenty for report timestamps.
+    """
+    global _iso_cache_second, _iso_cache_value
+    second = time.time_ns() // 1_000_000_000
+    if second != _iso_cache_second:
+        _iso_cache_second = second
+        _iso_cache_value = datetime.fromtimestamp(second).isoformat()
+    return _iso_cache_value
+
+
+@dataclass(slots=True)
+class ShodanMatch:
+    """A single Shodan match, slot-backed to cut per-result memory.
+
+    Large Shodan responses produce thousands of result items; storing
+    them as slotted instances instead of dicts roughly halves the
+    per-item footprint. Mapping-style access is kept for downstream
+    consumers that use ``item.get(...)``.
+    """
+    ip: Optional[str] = None
+    port: Optional[int] = None
+    hostname: List[str] = field(default_factory=list)
+    org: Optional[str] = None
+    os: Optional[str] = None
+    location: Dict[str, Any] = field(default_factory=dict)
+    vulns: List[str] = field(default_factory=list)
+    data: str = ''
+    timestamp: Optional[str] = None
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the match to a plain dict for JSON serialization."""
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class CensysHit:
+    """A single Censys host hit, slot-backed like `ShodanMatch`."""
+    ip: Optional[str] = None
+    name: Optional[str] = None
+    services: List[Dict[str, Any]] = field(default_factory=list)
+    location: Dict[str, Any] = field(default_factory=dict)
+    autonomous_system: Dict[str, Any] = field(default_factory=dict)
+    last_updated: Optional[str] = None
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the hit to a plain dict for JSON serialization."""
+        return asdict(self)
+
 
 class AdvancedSearchEngine(QObject):
     """Integration with IoT and infrastructure search engines."""
@@ -29,15 +151,69 @@ class AdvancedSearchEngine(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.search_cache = {}
-        
+        # Shodan banner data can be multi-KB per host and whole responses
+        # are cached, so cap what we keep of it per result.
+        self._max_data_bytes = 1024
+        # Retry transient failures (rate limits, gateway errors) so a
+        # single hiccup doesn't abort a whole batched sweep.
+        retry = Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'],
+                      respect_retry_after_header=True)
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(max_retries=retry,
+                                                    pool_maxsize=20))
+        # API credentials resolved lazily from config and memoized;
+        # cleared again when the relevant options change.
+        self._shodan_key = None
+        self._censys_id = None
+        self._censys_secret = None
+        # On-disk CVE cache: the records are effectively static, so
+        # repeat lookups (and repeat suite runs) skip the NVD
+        # round-trip entirely.
+        cve_db_path = Path(standarddir.data()) / 'osint' / 'cve.db'
+        cve_db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._cve_db = sqlite3.connect(str(cve_db_path))
+        self._cve_db.execute(
+            'CREATE TABLE IF NOT EXISTS cve '
+            '(id TEXT PRIMARY KEY, details TEXT, fetched_at INTEGER)')
+        self._cve_db.commit()
+        self._cve_ttl = 7 * 86400
+        if config is not None and getattr(config, 'instance', None) is not None:
+            config.instance.changed.connect(self._on_config_changed)
+
+    def _on_config_changed(self, option: str) -> None:
+        """Invalidate cached API credentials on config changes."""
+        if option.startswith('content.osint_'):
+            self._shodan_key = None
+            self._censys_id = None
+            self._censys_secret = None
+
+    def _get_shodan_key(self) -> Optional[str]:
+        """Get the configured Shodan API key, memoized per instance."""
+        if self._shodan_key is None and config is not None:
+            try:
+                self._shodan_key = config.val.content.osint_shodan_api_key
+            except AttributeError:
+                pass
+        return self._shodan_key
+
+    def _get_censys_creds(self) -> tuple:
+        """Get the configured Censys credentials, memoized per instance."""
+        if (self._censys_id is None or self._censys_secret is None) \
+                and config is not None:
+            try:
+                self._censys_id = config.val.content.osint_censys_api_id
+                self._censys_secret = config.val.content.osint_censys_api_secret
+            except AttributeError:
+                pass
+        return self._censys_id, self._censys_secret
+
     def search_shodan(self, query: str, api_key: Optional[str] = None) -> Dict[str, Any]:
         """Search Shodan for internet-connected devices."""
         if not api_key:
-            if config:
-                api_key = getattr(getattr(config.val, 'content', None), 'osint_shodan_api_key', None)
-            else:
-                api_key = None
-            
+            api_key = self._get_shodan_key()
+
         if not api_key:
             logger.warning("Shodan API key not configured")
             return {'error': 'Shodan API key required'}
@@ -49,7 +225,7 @@ class AdvancedSearchEngine(QObject):
         results = {
             'query': query,
             'engine': 'shodan',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_isoformat(),
             'total': 0,
             'results': []
         }
@@ -62,49 +238,60 @@ class AdvancedSearchEngine(QObject):
                 'facets': 'country,org,port,vuln'
             }
             
-            response = requests.get(url, params=params, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                results['total'] = data.get('total', 0)
-                
-                for match in data.get('matches', []):
-                    result_item = {
-                        'ip': match.get('ip_str'),
-                        'port': match.get('port'),
-                        'hostname': match.get('hostnames', []),
-                        'org': match.get('org'),
-                        'os': match.get('os'),
-                        'location': {
-                            'country': match.get('location', {}).get('country_name'),
-                            'city': match.get('location', {}).get('city'),
-                            'latitude': match.get('location', {}).get('latitude'),
-                            'longitude': match.get('location', {}).get('longitude')
-                        },
-                        'vulns': match.get('vulns', []),
-                        'data': match.get('data', ''),
-                        'timestamp': match.get('timestamp')
-                    }
-                    
-                    results['results'].append(result_item)
+            response = self._session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            results['total'] = data.get('total', 0)
+            
+            vuln_batch = []
+            for match in data.get('matches', []):
+                location = match.get('location', {})
+                result_item = ShodanMatch(
+                    ip=match.get('ip_str'),
+                    port=match.get('port'),
+                    hostname=match.get('hostnames', []),
+                    org=match.get('org'),
+                    os=match.get('os'),
+                    location={
+                        'country': location.get('country_name'),
+                        'city': location.get('city'),
+                        'latitude': location.get('latitude'),
+                        'longitude': location.get('longitude')
+                    },
+                    vulns=match.get('vulns', []),
+                    data=(match.get('data') or '')[:self._max_data_bytes],
+                    timestamp=match.get('timestamp')
+                )
+
+                results['results'].append(result_item)
+
+                # Check for vulnerabilities
+                if result_item.vulns:
+                    vuln_batch.append({
+                        'ip': result_item.ip,
+                        'vulns': result_item.vulns,
+                    })
+
+            # Emit one batched signal instead of one per vulnerable
+            # host; hundreds of per-host emits would each pay their
+            # own event-loop dispatch cost.
+            if vuln_batch:
+                self.vulnerability_found.emit({
+                    'batch': vuln_batch,
+                    'count': len(vuln_batch),
+                    'severity': 'high'
+                })
                     
-                    # Check for vulnerabilities
-                    if result_item['vulns']:
-                        self.vulnerability_found.emit({
-                            'ip': result_item['ip'],
-                            'vulns': result_item['vulns'],
-                            'severity': 'high'
-                        })
-                        
-                # Process facets for statistics
-                results['statistics'] = {
-                    'countries': data.get('facets', {}).get('country', []),
-                    'organizations': data.get('facets', {}).get('org', []),
-                    'ports': data.get('facets', {}).get('port', []),
-                    'vulnerabilities': data.get('facets', {}).get('vuln', [])
-                }
-                
-                self.search_cache[cache_key] = results
-                self.search_complete.emit(results)
+            # Process facets for statistics
+            results['statistics'] = {
+                'countries': data.get('facets', {}).get('country', []),
+                'organizations': data.get('facets', {}).get('org', []),
+                'ports': data.get('facets', {}).get('port', []),
+                'vulnerabilities': data.get('facets', {}).get('vuln', [])
+            }
+            
+            self.search_cache[cache_key] = results
+            self.search_complete.emit(results)
                 
         except Exception as e:
             logger.error(f"Shodan search failed for '{query}': {e}")
@@ -116,10 +303,8 @@ class AdvancedSearchEngine(QObject):
                      api_secret: Optional[str] = None) -> Dict[str, Any]:
         """Search Censys for internet assets."""
         if not api_id or not api_secret:
-            if config:
-                api_id = getattr(getattr(config.val, 'content', None), 'osint_censys_api_id', None)
-                api_secret = getattr(getattr(config.val, 'content', None), 'osint_censys_api_secret', None)
-            
+            api_id, api_secret = self._get_censys_creds()
+
             if not api_id or not api_secret:
                 logger.warning("Censys API credentials not configured")
                 return {'error': 'Censys API credentials required'}
@@ -131,7 +316,7 @@ class AdvancedSearchEngine(QObject):
         results = {
             'query': query,
             'engine': 'censys',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_isoformat(),
             'total': 0,
             'results': []
         }
@@ -148,36 +333,34 @@ class AdvancedSearchEngine(QObject):
                 'virtual_hosts': 'INCLUDE'
             }
             
-            response = requests.get(url, params=params, headers=headers, 
-                                  auth=(api_id, api_secret), timeout=30)
-                                  
-            if response.status_code == 200:
-                data = response.json()
-                results['total'] = data.get('result', {}).get('total', 0)
-                
-                for hit in data.get('result', {}).get('hits', []):
-                    result_item = {
-                        'ip': hit.get('ip'),
-                        'name': hit.get('name'),
-                        'services': [],
-                        'location': hit.get('location', {}),
-                        'autonomous_system': hit.get('autonomous_system', {}),
-                        'last_updated': hit.get('last_updated_at')
-                    }
-                    
-                    # Process services
-                    for service in hit.get('services', []):
-                        result_item['services'].append({
-                            'port': service.get('port'),
-                            'service_name': service.get('service_name'),
-                            'transport_protocol': service.get('transport_protocol'),
-                            'extended_service_name': service.get('extended_service_name')
-                        })
-                        
-                    results['results'].append(result_item)
+            response = self._session.get(url, params=params, headers=headers,
+                                        auth=(api_id, api_secret), timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            results['total'] = data.get('result', {}).get('total', 0)
+            
+            for hit in data.get('result', {}).get('hits', []):
+                result_item = CensysHit(
+                    ip=hit.get('ip'),
+                    name=hit.get('name'),
+                    location=hit.get('location', {}),
+                    autonomous_system=hit.get('autonomous_system', {}),
+                    last_updated=hit.get('last_updated_at')
+                )
+
+                # Process services
+                for service in hit.get('services', []):
+                    result_item.services.append({
+                        'port': service.get('port'),
+                        'service_name': service.get('service_name'),
+                        'transport_protocol': service.get('transport_protocol'),
+                        'extended_service_name': service.get('extended_service_name')
+                    })
                     
-                self.search_cache[cache_key] = results
-                self.search_complete.emit(results)
+                results['results'].append(result_item)
+                
+            self.search_cache[cache_key] = results
+            self.search_complete.emit(results)
                 
         except Exception as e:
             logger.error(f"Censys search failed for '{query}': {e}")
@@ -187,9 +370,13 @@ class AdvancedSearchEngine(QObject):
     
     def search_by_cve(self, cve_id: str) -> Dict[str, Any]:
         """Search for systems vulnerable to a specific CVE."""
+        if not _CVE_RE.match(cve_id):
+            logger.warning(f"Malformed CVE identifier: {cve_id!r}")
+            return {'cve': cve_id, 'error': 'Invalid CVE identifier'}
+
         results = {
             'cve': cve_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_isoformat(),
             'vulnerable_systems': []
         }
         
@@ -216,48 +403,51 @@ class AdvancedSearchEngine(QObject):
     
     def _get_cve_details(self, cve_id: str) -> Optional[Dict[str, Any]]:
         """Get CVE details from NVD (National Vulnerability Database)."""
+        # Short-circuit obvious garbage before any network I/O.
+        if not _CVE_RE.match(cve_id):
+            return None
+
+        # Serve from the on-disk cache when the record is still fresh.
+        row = self._cve_db.execute(
+            'SELECT details FROM cve WHERE id = ? AND fetched_at > ?',
+            (cve_id, int(time.time()) - self._cve_ttl)).fetchone()
+        if row is not None:
+            return json.loads(row[0])
+
         try:
-            url = f"https://services.nvd.nist.gov/rest/json/cves/2.0?cveId={cve_id}"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                vulnerabilities = data.get('vulnerabilities', [])
-                
-                if vulnerabilities:
-                    cve_item = vulnerabilities[0].get('cve', {})
-                    
-                    return {
-                        'id': cve_item.get('id'),
-                        'description': cve_item.get('descriptions', [{}])[0].get('value', ''),
-                        'severity': cve_item.get('metrics', {}).get('cvssMetricV31', [{}])[0].get('cvssData', {}).get('baseSeverity', 'UNKNOWN'),
-                        'score': cve_item.get('metrics', {}).get('cvssMetricV31', [{}])[0].get('cvssData', {}).get('baseScore', 0),
-                        'published': cve_item.get('published'),
-                        'last_modified': cve_item.get('lastModified')
-                    }
-                    
+            url = f"https://services.nvd.nist.gov/rest/json/cves/2.0?cveId={quote(cve_id)}"
+            response = self._session.get(url, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            vulnerabilities = data.get('vulnerabilities', [])
+
+            if vulnerabilities:
+                cve_item = vulnerabilities[0].get('cve', {})
+
+                details = {
+                    'id': cve_item.get('id'),
+                    'description': cve_item.get('descriptions', [{}])[0].get('value', ''),
+                    'severity': cve_item.get('metrics', {}).get('cvssMetricV31', [{}])[0].get('cvssData', {}).get('baseSeverity', 'UNKNOWN'),
+                    'score': cve_item.get('metrics', {}).get('cvssMetricV31', [{}])[0].get('cvssData', {}).get('baseScore', 0),
+                    'published': cve_item.get('published'),
+                    'last_modified': cve_item.get('lastModified')
+                }
+                with self._cve_db:
+                    self._cve_db.execute(
+                        'INSERT OR REPLACE INTO cve VALUES (?, ?, ?)',
+                        (cve_id, json.dumps(details), int(time.time())))
+                return details
+
         except Exception as e:
             logger.error(f"Failed to get CVE details for {cve_id}: {e}")
-            
+
         return None
     
     def search_exposed_databases(self) -> List[Dict[str, Any]]:
         """Search for exposed databases and data stores."""
         exposed_dbs = []
-        
-        # Common exposed database signatures
-        db_queries = [
-            ('mongodb', 'port:27017 -authentication'),
-            ('elasticsearch', 'port:9200 json'),
-            ('redis', 'port:6379 -requirepass'),
-            ('cassandra', 'port:9042 "Invalid or unsupported protocol version"'),
-            ('mysql', 'port:3306 "mysql_native_password"'),
-            ('postgresql', 'port:5432 "PostgreSQL"'),
-            ('couchdb', 'port:5984 "couchdb"'),
-            ('memcached', 'port:11211 "STAT items"')
-        ]
-        
-        for db_type, query in db_queries:
+
+        for db_type, query in _DB_QUERIES:
             results = self.search_shodan(query)
             
             if 'results' in results:
@@ -277,19 +467,8 @@ class AdvancedSearchEngine(QObject):
     def search_industrial_control_systems(self) -> List[Dict[str, Any]]:
         """Search for exposed industrial control systems."""
         ics_results = []
-        
-        # Common ICS/SCADA search queries
-        ics_queries = [
-            ('modbus', 'port:502'),
-            ('dnp3', 'port:20000 source address'),
-            ('s7', 'port:102'),
-            ('bacnet', 'port:47808'),
-            ('niagara', 'port:1911,4911 product:Niagara'),
-            ('scada', '"SCADA"'),
-            ('plc', '"Programmable Logic Controller"')
-        ]
-        
-        for system_type, query in ics_queries:
+
+        for system_type, query in _ICS_QUERIES:
             results = self.search_shodan(query)
             
             if 'results' in results:
@@ -310,21 +489,13 @@ class AdvancedSearchEngine(QObject):
     def find_default_credentials(self, ip: str) -> List[Dict[str, Any]]:
         """Search for services potentially using default credentials."""
         default_cred_indicators = []
-        
-        # Search for common services with default credentials
-        services_to_check = [
-            {'service': 'webcam', 'query': f'ip:{ip} "default password"'},
-            {'service': 'router', 'query': f'ip:{ip} "admin/admin"'},
-            {'service': 'printer', 'query': f'ip:{ip} port:9100'},
-            {'service': 'iot', 'query': f'ip:{ip} "default login"'}
-        ]
-        
-        for service_info in services_to_check:
-            results = self.search_shodan(service_info['query'])
-            
+
+        for service, query_template in _DEFAULT_CRED_QUERIES:
+            results = self.search_shodan(query_template.format(ip=ip))
+
             if results.get('total', 0) > 0:
                 default_cred_indicators.append({
-                    'service': service_info['service'],
+                    'service': service,
                     'ip': ip,
                     'likelihood': 'high',
                     'recommendation': 'Change default credentials immediately'
@@ -335,15 +506,24 @@ class AdvancedSearchEngine(QObject):
     def create_report(self, query: str, results: Dict[str, Any]) -> IntelligenceReport:
         """Create an intelligence report from search results."""
         confidence = 0.7  # Moderate confidence for search results
-        
+
         if results.get('total', 0) > 0:
             confidence = 0.8
-            
+
+        if results.get('results'):
+            # Flatten slotted result items back to dicts so the report
+            # stays JSON-serializable.
+            results = dict(results)
+            results['results'] = [
+                item.to_dict() if hasattr(item, 'to_dict') else item
+                for item in results['results']
+            ]
+
         return IntelligenceReport(
             source='advanced_search',
             target=query,
             data_type='infrastructure_search',
             data=results,
             confidence=confidence,
-            tags=['search', 'infrastructure', 'iot', 'exposure']
+            tags=('search', 'infrastructure', 'iot', 'exposure')
         )
\ No newline at end of file
@@ -1,20 +1,152 @@
 """Supply chain mapping and analysis module."""
 
 import re
+import sys
 import json
+import time
 import logging
+import hashlib
+import functools
 from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+import threading
+from collections import defaultdict, deque, Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PyQt6.QtCore import QObject, pyqtSignal
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from qutebrowser.utils import message, log
+try:
+    from qutebrowser.utils import standarddir
+except ImportError:
+    # For testing without full qutebrowser environment
+    import tempfile
+
+    class MockStandardDir:
+        @staticmethod
+        def data():
+            return Path(tempfile.gettempdir()) / 'qutebrowser_test'
+    standarddir = MockStandardDir()
+
+
+def _json_loads(response: requests.Response) -> Any:
+    """Parse a JSON response body, using orjson when available.
+
+    EDGAR companyfacts documents run to multiple megabytes of which we
+    read a handful of fields; orjson parses them several times faster
+    than the stdlib parser.
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 from qutebrowser.osint.core import IntelligenceReport
 
 logger = log.osint_supply = logging.getLogger('osint.supply_chain')
 
+# Common technology keywords to search for in job postings
+_TECH_KEYWORDS = (
+    'Python', 'Java', 'JavaScript', 'React', 'Angular', 'Vue',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins',
+    'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
+    'TensorFlow', 'PyTorch', 'Spark', 'Hadoop', 'Kafka',
+)
+
+# One compiled alternation finds all keywords in a single scan instead
+# of one substring search per keyword. Longest names first so e.g.
+# 'JavaScript' matches ahead of 'Java'.
+_TECH_KEYWORD_RE = re.compile(
+    '|'.join(re.escape(kw)
+             for kw in sorted(_TECH_KEYWORDS, key=len, reverse=True)),
+    re.IGNORECASE)
+_TECH_CANONICAL = {kw.lower(): kw for kw in _TECH_KEYWORDS}
+
+
+def _extract_tech_keywords(text: str) -> Counter:
+    """Count known technology keywords in text with one pass."""
+    return Counter(_TECH_CANONICAL[match.group(0).lower()]
+                   for match in _TECH_KEYWORD_RE.finditer(text))
+
+
+def _intern_opt(value: Optional[str]) -> Optional[str]:
+    """Intern a string if present.
+
+    Vendor names, countries and product labels repeat heavily across
+    trade records; interning collapses the duplicates to one object
+    apiece and makes later equality checks pointer comparisons.
+    """
+    return sys.intern(value) if value is not None else None
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """json.dump default hook flattening slotted records to dicts."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} "
+                    f"is not JSON serializable")
+
+
+@dataclass(slots=True)
+class Vendor:
+    """A vendor/customer trade relationship, slot-backed to cut memory.
+
+    Tier-3 supply maps hold tens of thousands of these; the slotted
+    layout roughly halves the per-record footprint versus a dict.
+    Mapping-style access is kept for downstream ``.get(...)`` callers.
+    """
+    name: Optional[str] = None
+    country: Optional[str] = None
+    products: List[str] = field(default_factory=list)
+    last_shipment: Optional[str] = None
+    frequency: int = 1
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a plain dict for JSON serialization."""
+        return asdict(self)
+
+
+class _RateLimiter:
+    """Token bucket limiting calls to max_calls per period seconds.
+
+    SEC EDGAR enforces a 10 req/s limit; bursting past it under the
+    nth-party fan-out causes 429s and retry storms that dominate wall
+    time, so calls are throttled before they go out.
+    """
+
+    def __init__(self, max_calls: int, period: float = 1.0):
+        self._max_calls = max_calls
+        self._period = period
+        self._calls: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call slot is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self._period:
+                    self._calls.popleft()
+                if len(self._calls) < self._max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self._period - (now - self._calls[0])
+            time.sleep(wait)
+
 
 class SupplyChainMapper(QObject):
     """Mapper for supply chain intelligence and vendor relationships."""
@@ -22,55 +154,197 @@ class SupplyChainMapper(QObject):
     vendor_found = pyqtSignal(dict)
     supply_chain_mapped = pyqtSignal(dict)
     risk_identified = pyqtSignal(dict)
-    
+    # Emitted after each tier of map_nth_party_vendors with the tier
+    # number and its vendor entries, so the UI can show partial results
+    # while deeper tiers are still being crawled.
+    tier_completed = pyqtSignal(int, list)
+
+    # XBRL tags backing the extracted financial metrics; shared by the
+    # per-company facts extraction and the bulk frames prefetch.
+    _METRIC_TAGS = {
+        'revenue': 'Revenues',
+        'net_income': 'NetIncomeLoss',
+        'assets': 'Assets',
+        'liabilities': 'Liabilities',
+        'cash': 'CashAndCashEquivalentsAtCarryingValue'
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.company_cache = {}
-        self.vendor_relationships = defaultdict(set)
-        
-    def analyze_company(self, company_name: str) -> Dict[str, Any]:
-        """Analyze a company's supply chain and vendor relationships."""
-        if company_name in self.company_cache:
-            return self.company_cache[company_name]
-            
+        # Guards company_cache now that batch lookups analyze several
+        # companies from worker threads at once.
+        self._cache_lock = threading.Lock()
+        # Vendor graph kept as int-interned adjacency sets: node names
+        # are interned to dense ids once, so traversals compare small
+        # ints instead of hashing repeated vendor-name strings.
+        self._name_to_id: Dict[str, int] = {}
+        self._id_to_name: List[str] = []
+        self._adjacency: List[Set[int]] = []
+        # The per-company lookups are network-bound, so independent
+        # queries (trade DBs, SEC EDGAR, tech stack) overlap in threads
+        # instead of paying the sum of their latencies.
+        self._executor = ThreadPoolExecutor(max_workers=16,
+                                            thread_name_prefix='osint-supply')
+        # Separate pool for fanning out whole batches of companies, so
+        # batch jobs never starve the per-company sub-lookups above.
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix='osint-supply-batch')
+        # Company analyses are also cached on disk so a fresh mapper
+        # instance doesn't re-query SEC/GitHub for recently seen
+        # companies. 24h TTL matches EDGAR's filing cadence.
+        self._edgar_limiter = _RateLimiter(10, 1.0)
+        # One pooled session shared by all lookups: connections to
+        # data.sec.gov and api.github.com are kept alive across the many
+        # requests a vendor-tier crawl makes, instead of paying a fresh
+        # TCP+TLS handshake per call.
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                              max_retries=retry)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        # Frames responses keyed by (tag, unit, period): one frames
+        # document covers a fact for every filer at once.
+        self._frames_cache: Dict[Tuple[str, str, str], Dict[int, Any]] = {}
+        self._disk_cache_ttl = 86400
+        self._disk_cache_path = (Path(standarddir.data()) / 'osint' /
+                                 'cache' / 'supply_chain')
+        self._disk_cache_path.mkdir(parents=True, exist_ok=True)
+
+    def _intern_name(self, name: str) -> int:
+        """Intern a company/vendor name to its dense node id."""
+        node_id = self._name_to_id.get(name)
+        if node_id is None:
+            node_id = len(self._id_to_name)
+            self._name_to_id[name] = node_id
+            self._id_to_name.append(name)
+            self._adjacency.append(set())
+        return node_id
+
+    def _add_vendor_edge(self, parent: str, vendor: str) -> None:
+        """Record a parent → vendor relationship in the graph."""
+        self._adjacency[self._intern_name(parent)].add(
+            self._intern_name(vendor))
+
+    def get_vendors_of(self, company: str) -> Set[str]:
+        """Get the direct vendors recorded for a company."""
+        node_id = self._name_to_id.get(company)
+        if node_id is None:
+            return set()
+        return {self._id_to_name[v] for v in self._adjacency[node_id]}
+
+    def _disk_cache_file(self, company: str) -> Path:
+        """Get the cache file path for a company.
+
+        Filenames are a short fast hash of the company name: constant
+        length, collision-free in practice, and no risk of two names
+        sanitizing to the same filename.
+        """
+        digest = hashlib.blake2b(company.encode('utf-8'),
+                                 digest_size=8).hexdigest()
+        return self._disk_cache_path / f'{digest}.json'
+
+    def _disk_cache_get(self, company: str) -> Optional[Dict[str, Any]]:
+        """Load a cached analysis from disk if still within TTL."""
+        try:
+            with open(self._disk_cache_file(company), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('cached_at', 0) > self._disk_cache_ttl:
+            return None
+        return entry.get('result')
+
+    def _disk_cache_set(self, company: str, result: Dict[str, Any]) -> None:
+        """Persist an analysis result to the disk cache."""
+        entry = {'cached_at': time.time(), 'result': result}
+        try:
+            with open(self._disk_cache_file(company), 'w') as f:
+                json.dump(entry, f, default=_to_jsonable)
+        except (OSError, TypeError) as e:
+            logger.debug(f"Failed to cache analysis for {company}: {e}")
+
+    def analyze_company(self, company_name: str, emit: bool = True,
+                        fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Analyze a company's supply chain and vendor relationships.
+
+        With emit=False the supply_chain_mapped signal is suppressed;
+        batch callers use this so a tier fan-out doesn't flood the UI
+        thread with one cross-thread signal per company.
+
+        fields restricts which result keys are actually researched
+        ('vendors', 'financial_data', 'technologies', ...); lookups
+        whose output would be discarded are skipped entirely. None
+        means a full analysis. Restricted results keep the full dict
+        shape with empty defaults for the skipped keys.
+        """
+        fields_key = frozenset(fields) if fields is not None else None
+        cache_key = (company_name, fields_key)
+        with self._cache_lock:
+            if cache_key in self.company_cache:
+                return self.company_cache[cache_key]
+
+        # Only full analyses go through the disk cache, so a partial
+        # result can never be served where a full one is expected.
+        if fields_key is None:
+            cached = self._disk_cache_get(company_name)
+            if cached is not None:
+                with self._cache_lock:
+                    self.company_cache[cache_key] = cached
+                return cached
+
+        def wanted(*keys: str) -> bool:
+            return fields_key is None or bool(fields_key & set(keys))
+
+        # The lookups are independent, so fetch the wanted ones
+        # concurrently.
+        trade_future = (self._executor.submit(self._search_trade_databases,
+                                              company_name)
+                        if wanted('vendors', 'customers') else None)
+        corporate_future = (self._executor.submit(
+            self._search_corporate_filings, company_name)
+            if wanted('financial_data', 'subsidiaries', 'parent_company')
+            else None)
+        tech_future = (self._executor.submit(self._identify_technology_stack,
+                                             company_name)
+                       if wanted('technologies') else None)
+
+        trade_data = (trade_future.result() or {}) if trade_future else {}
+        corporate_data = ((corporate_future.result() or {})
+                          if corporate_future else {})
+        tech_stack = (tech_future.result() or []) if tech_future else []
+
+        # Build the result in a single literal rather than mutating a
+        # placeholder dict field by field.
         result = {
             'company': company_name,
             'timestamp': datetime.now().isoformat(),
-            'vendors': [],
-            'customers': [],
+            'vendors': trade_data.get('suppliers', []),
+            'customers': trade_data.get('buyers', []),
             'partners': [],
-            'subsidiaries': [],
-            'parent_company': None,
-            'financial_data': {},
+            'subsidiaries': corporate_data.get('subsidiaries', []),
+            'parent_company': corporate_data.get('parent', None),
+            'financial_data': corporate_data.get('financials', {}),
             'risk_assessment': {},
-            'technologies': [],
+            'technologies': tech_stack,
             'certifications': [],
             'locations': []
         }
+
+        # Risk assessment needs the full picture, so it only runs for
+        # unrestricted analyses.
+        if fields_key is None:
+            result['risk_assessment'] = self._assess_supply_chain_risk(result)
         
-        # Search for import/export data
-        trade_data = self._search_trade_databases(company_name)
-        if trade_data:
-            result['vendors'] = trade_data.get('suppliers', [])
-            result['customers'] = trade_data.get('buyers', [])
-            
-        # Search for corporate filings
-        corporate_data = self._search_corporate_filings(company_name)
-        if corporate_data:
-            result['financial_data'] = corporate_data.get('financials', {})
-            result['subsidiaries'] = corporate_data.get('subsidiaries', [])
-            result['parent_company'] = corporate_data.get('parent', None)
-            
-        # Search for technology stack
-        tech_stack = self._identify_technology_stack(company_name)
-        if tech_stack:
-            result['technologies'] = tech_stack
-            
-        # Perform risk assessment
-        result['risk_assessment'] = self._assess_supply_chain_risk(result)
-        
-        self.company_cache[company_name] = result
-        self.supply_chain_mapped.emit(result)
+        with self._cache_lock:
+            self.company_cache[cache_key] = result
+        if fields_key is None:
+            self._disk_cache_set(company_name, result)
+        if emit:
+            self.supply_chain_mapped.emit(result)
         
         return result
     
@@ -94,24 +368,26 @@ class SupplyChainMapper(QObject):
             # Search for company as consignee (importer)
             suppliers = self._query_import_records(company, 'consignee')
             for supplier in suppliers:
-                trade_data['suppliers'].append({
-                    'name': supplier.get('shipper'),
-                    'country': supplier.get('origin_country'),
-                    'products': supplier.get('products', []),
-                    'last_shipment': supplier.get('date'),
-                    'frequency': supplier.get('shipment_count', 1)
-                })
-                
+                trade_data['suppliers'].append(Vendor(
+                    name=_intern_opt(supplier.get('shipper')),
+                    country=_intern_opt(supplier.get('origin_country')),
+                    products=[sys.intern(p)
+                              for p in supplier.get('products', [])],
+                    last_shipment=supplier.get('date'),
+                    frequency=supplier.get('shipment_count', 1)
+                ))
+
             # Search for company as shipper (exporter)
             buyers = self._query_import_records(company, 'shipper')
             for buyer in buyers:
-                trade_data['buyers'].append({
-                    'name': buyer.get('consignee'),
-                    'country': buyer.get('destination_country'),
-                    'products': buyer.get('products', []),
-                    'last_shipment': buyer.get('date'),
-                    'frequency': buyer.get('shipment_count', 1)
-                })
+                trade_data['buyers'].append(Vendor(
+                    name=_intern_opt(buyer.get('consignee')),
+                    country=_intern_opt(buyer.get('destination_country')),
+                    products=[sys.intern(p)
+                              for p in buyer.get('products', [])],
+                    last_shipment=buyer.get('date'),
+                    frequency=buyer.get('shipment_count', 1)
+                ))
                 
         except Exception as e:
             logger.error(f"Failed to search trade databases for {company}: {e}")
@@ -170,15 +446,17 @@ class SupplyChainMapper(QObject):
                 'User-Agent': 'Qutebrowser OSINT Module (contact@example.com)'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
+            self._edgar_limiter.acquire()
+            response = self._session.get(url, headers=headers, timeout=30)
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response)
                 
                 # Extract relevant financial data
                 facts = data.get('facts', {})
                 
                 return {
-                    'financials': self._extract_financial_metrics(facts),
+                    'financials': self._extract_financial_metrics(facts,
+                                                                  cik=cik),
                     'fiscal_year_end': data.get('fiscal_year_end'),
                     'entity_name': data.get('entityName')
                 }
@@ -188,40 +466,96 @@ class SupplyChainMapper(QObject):
             
         return None
     
+    def _query_sec_frames(self, tag: str, period: str,
+                          unit: str = 'USD') -> Dict[int, Any]:
+        """Query EDGAR's frames endpoint for one fact across all filers.
+
+        When the same metric is needed for many companies, a single
+        ~100KB frames document replaces one multi-MB companyfacts
+        download per company. Results are cached per (tag, unit,
+        period) and keyed by CIK.
+        """
+        cache_key = (tag, unit, period)
+        cached = self._frames_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        by_cik: Dict[int, Any] = {}
+        try:
+            url = (f"https://data.sec.gov/api/xbrl/frames/us-gaap/"
+                   f"{tag}/{unit}/{period}.json")
+            headers = {
+                'User-Agent': 'Qutebrowser OSINT Module (contact@example.com)'
+            }
+
+            self._edgar_limiter.acquire()
+            response = self._session.get(url, headers=headers, timeout=30)
+            if response.status_code == 200:
+                data = _json_loads(response)
+                for entry in data.get('data', []):
+                    by_cik[entry.get('cik')] = {
+                        'value': entry.get('val'),
+                        'date': entry.get('end'),
+                        'period': period
+                    }
+
+        except Exception as e:
+            logger.debug(f"SEC frames query failed for {tag}/{period}: {e}")
+
+        self._frames_cache[cache_key] = by_cik
+        return by_cik
+
+    def _prefetch_financial_frames(self) -> None:
+        """Warm the frames cache before a batch of full analyses.
+
+        One frames document per metric covers the fact for every SEC
+        filer at once, so _extract_financial_metrics can serve the
+        companies in the batch from cache instead of relying on each
+        one's multi-MB companyfacts download.
+        """
+        # Most recent complete calendar year, in EDGAR frame notation.
+        period = f'CY{datetime.now().year - 1}'
+        for tag in self._METRIC_TAGS.values():
+            self._query_sec_frames(tag, period)
+
     def _get_company_cik(self, company: str) -> Optional[int]:
         """Get CIK (Central Index Key) for a company."""
         # This would query SEC's company tickers JSON
         # For demo purposes, returning None
         return None
     
-    def _extract_financial_metrics(self, facts: Dict) -> Dict[str, Any]:
+    def _extract_financial_metrics(self, facts: Dict,
+                                   cik: Optional[int] = None) -> Dict[str, Any]:
         """Extract key financial metrics from XBRL facts."""
         metrics = {}
         
         # Extract common financial metrics
         us_gaap = facts.get('us-gaap', {})
         
-        metric_mapping = {
-            'revenue': 'Revenues',
-            'net_income': 'NetIncomeLoss',
-            'assets': 'Assets',
-            'liabilities': 'Liabilities',
-            'cash': 'CashAndCashEquivalentsAtCarryingValue'
-        }
-        
-        for key, xbrl_name in metric_mapping.items():
-            if xbrl_name in us_gaap:
-                units = us_gaap[xbrl_name].get('units', {})
-                if 'USD' in units:
-                    values = units['USD']
-                    if values:
-                        # Get most recent value
-                        latest = sorted(values, key=lambda x: x.get('end', ''))[-1]
-                        metrics[key] = {
-                            'value': latest.get('val'),
-                            'date': latest.get('end'),
-                            'period': latest.get('frame')
-                        }
+        for key, xbrl_name in self._METRIC_TAGS.items():
+            # Prefer an already-fetched frames document over the
+            # per-company facts.
+            if cik is not None:
+                frame_hit = next(
+                    (frames[cik]
+                     for (tag, _unit, _period), frames
+                     in self._frames_cache.items()
+                     if tag == xbrl_name and cik in frames),
+                    None)
+                if frame_hit is not None:
+                    metrics[key] = frame_hit
+                    continue
+
+            values = us_gaap.get(xbrl_name, {}).get('units', {}).get('USD')
+            if values:
+                # Get most recent value; single O(n) pass instead of a
+                # full sort per metric.
+                latest = max(values, key=lambda x: x.get('end') or '')
+                metrics[key] = {
+                    'value': latest.get('val'),
+                    'date': latest.get('end'),
+                    'period': latest.get('frame')
+                }
                         
         return metrics
     
@@ -271,18 +605,18 @@ class SupplyChainMapper(QObject):
         try:
             # GitHub API search
             url = f"https://api.github.com/search/users?q={company}+type:org"
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
-                
+                data = _json_loads(response)
+
                 for org in data.get('items', [])[:3]:  # Check top 3 results
                     # Get organization repos
                     repos_url = org.get('repos_url')
                     if repos_url:
-                        repos_response = requests.get(repos_url, timeout=10)
+                        repos_response = self._session.get(repos_url, timeout=10)
                         if repos_response.status_code == 200:
-                            org_repos = repos_response.json()
+                            org_repos = _json_loads(repos_response)
                             
                             for repo in org_repos:
                                 repos.append({
@@ -300,18 +634,23 @@ class SupplyChainMapper(QObject):
     def _analyze_job_postings(self, company: str) -> List[Dict[str, str]]:
         """Analyze job postings to identify technology requirements."""
         tech_requirements = []
-        
-        # Common technology keywords to search for
-        tech_keywords = [
-            'Python', 'Java', 'JavaScript', 'React', 'Angular', 'Vue',
-            'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins',
-            'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
-            'TensorFlow', 'PyTorch', 'Spark', 'Hadoop', 'Kafka'
-        ]
-        
+
         # This would query job posting APIs or scrape job sites
-        # For demonstration, returning empty list
-        
+        # For demonstration, no postings are fetched
+        postings: List[str] = []
+
+        keyword_counts: Counter = Counter()
+        for posting in postings:
+            keyword_counts.update(_extract_tech_keywords(posting))
+
+        for keyword, count in keyword_counts.items():
+            tech_requirements.append({
+                'type': 'job_requirement',
+                'name': keyword,
+                'mentions': str(count),
+                'source': 'job_postings'
+            })
+
         return tech_requirements
     
     def _search_sbom(self, company: str) -> List[Dict[str, Any]]:
@@ -329,12 +668,17 @@ class SupplyChainMapper(QObject):
             'recommendations': []
         }
         
-        # Check geographic concentration risk
+        # One pass over the vendor list collects both the country set
+        # (geographic concentration) and the critical-vendor count
+        # (single points of failure).
         supplier_countries = set()
+        critical_vendors = []
         for vendor in company_data.get('vendors', []):
             if vendor.get('country'):
                 supplier_countries.add(vendor['country'])
-                
+            if vendor.get('frequency', 0) > 10:
+                critical_vendors.append(vendor)
+
         if len(supplier_countries) <= 2:
             risk_assessment['risk_factors'].append({
                 'type': 'geographic_concentration',
@@ -342,10 +686,7 @@ class SupplyChainMapper(QObject):
                 'description': f'Supply chain concentrated in {len(supplier_countries)} countries'
             })
             risk_assessment['overall_risk'] = 'high'
-            
-        # Check for single points of failure
-        critical_vendors = [v for v in company_data.get('vendors', []) 
-                          if v.get('frequency', 0) > 10]
+
         if critical_vendors:
             risk_assessment['risk_factors'].append({
                 'type': 'vendor_dependency',
@@ -386,15 +727,31 @@ class SupplyChainMapper(QObject):
             'total_vendors': 0
         }
         
+        # Track every name seen so far so diamond/cyclic supply graphs
+        # don't trigger redundant re-analysis in later tiers. The set
+        # holds interned int node ids rather than the names themselves:
+        # small ints hash faster and cost a fraction of the memory of
+        # duplicated vendor-name strings on wide maps.
+        visited = {self._intern_name(company)}
         current_tier = [company]
-        
+
         for tier_level in range(1, depth + 1):
-            next_tier = []
+            next_tier: Set[str] = set()
             supply_chain_map[f'tier_{tier_level}'] = []
-            
+
+            # Analyze the whole tier as one batch; each company's
+            # analysis is tagged by name so results map back regardless
+            # of completion order.
+            tier_results = dict(zip(
+                current_tier,
+                self._batch_executor.map(
+                    functools.partial(self.analyze_company, emit=False,
+                                      fields={'vendors'}),
+                    current_tier)))
+
             for company_name in current_tier:
-                company_data = self.analyze_company(company_name)
-                
+                company_data = tier_results[company_name]
+
                 for vendor in company_data.get('vendors', []):
                     vendor_name = vendor.get('name')
                     if vendor_name:
@@ -404,11 +761,18 @@ class SupplyChainMapper(QObject):
                             'country': vendor.get('country'),
                             'products': vendor.get('products', [])
                         })
-                        next_tier.append(vendor_name)
                         supply_chain_map['total_vendors'] += 1
-                        
-            current_tier = list(set(next_tier))  # Remove duplicates
-            
+                        self._add_vendor_edge(company_name, vendor_name)
+                        vendor_id = self._intern_name(vendor_name)
+                        if vendor_id not in visited:
+                            visited.add(vendor_id)
+                            next_tier.add(vendor_name)
+
+            self.tier_completed.emit(tier_level,
+                                     supply_chain_map[f'tier_{tier_level}'])
+
+            current_tier = list(next_tier)
+
             if not current_tier:
                 break  # No more vendors to explore
                 
@@ -416,20 +780,32 @@ class SupplyChainMapper(QObject):
     
     def identify_shared_suppliers(self, companies: List[str]) -> Dict[str, List[str]]:
         """Identify suppliers shared between multiple companies."""
-        shared_suppliers = defaultdict(list)
-        
-        for company in companies:
-            company_data = self.analyze_company(company)
-            
-            for vendor in company_data.get('vendors', []):
-                vendor_name = vendor.get('name')
-                if vendor_name:
-                    shared_suppliers[vendor_name].append(company)
-                    
+        by_vendor: Dict[str, List[str]] = {}
+
+        # These are full analyses (financials included), so fetch the
+        # bulk frames documents once up front for the whole batch.
+        if len(companies) > 1:
+            self._prefetch_financial_frames()
+
+        # Analyze the companies concurrently; each analysis is
+        # network-bound and independent of the others.
+        analyses = zip(companies,
+                       self._batch_executor.map(
+                           functools.partial(self.analyze_company,
+                                             emit=False),
+                           companies))
+        for company, company_data in analyses:
+            # Dedupe per company first, so a vendor listed twice for
+            # one company cannot masquerade as a shared supplier.
+            vendor_names = {vendor.get('name')
+                            for vendor in company_data.get('vendors', [])}
+            vendor_names.discard(None)
+            for vendor_name in vendor_names:
+                by_vendor.setdefault(vendor_name, []).append(company)
+
         # Filter to only shared suppliers
-        shared_suppliers = {k: v for k, v in shared_suppliers.items() if len(v) > 1}
-        
-        return dict(shared_suppliers)
+        return {name: owners for name, owners in by_vendor.items()
+                if len(owners) > 1}
     
     def analyze_patent_dependencies(self, company: str) -> List[Dict[str, Any]]:
         """Analyze patent filings to identify technology dependencies."""
@@ -488,7 +864,18 @@ class SupplyChainMapper(QObject):
             tags.append('high_risk')
         elif risk_level == 'critical':
             tags.append('critical_risk')
-            
+
+        # Flatten slotted vendor records back to dicts so the report
+        # stays JSON-serializable.
+        for key in ('vendors', 'customers'):
+            items = supply_chain_data.get(key)
+            if items:
+                supply_chain_data = dict(supply_chain_data)
+                supply_chain_data[key] = [
+                    item.to_dict() if hasattr(item, 'to_dict') else item
+                    for item in items
+                ]
+
         return IntelligenceReport(
             source='supply_chain_mapper',
             target=company,
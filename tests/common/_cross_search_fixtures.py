@@ -0,0 +1,51 @@
+"""Shared fixtures for the cross-search test modules.
+
+tests/integration/test_cross_search_integration.py and
+tests/test_advanced_search_all.py previously each carried their own
+copies of the path constants, file-read cache and handler setup, so a
+full run paid for everything twice. Keeping them here means the stats,
+reads and handler construction happen once per run.
+"""
+
+import os
+import sys
+import functools
+from pathlib import Path
+
+QUTE_DIR = Path(os.path.expanduser(
+    '~/Library/Application Support/qutebrowser'))
+CONFIG_FILE = QUTE_DIR / 'config.py'
+SCRIPTS_DIR = QUTE_DIR / 'scripts'
+CROSS_SEARCH_SCRIPT = SCRIPTS_DIR / 'cross_search.py'
+USERSCRIPT = QUTE_DIR / 'userscripts' / 'cross_search'
+
+# Stat each fixture path once at import; every existence test reuses
+# the same answer instead of issuing its own syscall.
+PATH_EXISTS = {p: p.exists() for p in (CONFIG_FILE, CROSS_SEARCH_SCRIPT,
+                                       USERSCRIPT)}
+USERSCRIPT_EXECUTABLE = os.access(USERSCRIPT, os.X_OK)
+
+# Import the script as a module so URL-generation tests run in-process
+# instead of paying a full interpreter start per query.
+sys.path.insert(0, str(SCRIPTS_DIR))
+try:
+    import cross_search
+except ImportError:
+    cross_search = None
+
+# One handler shared by both test modules; it is stateless between
+# calls.
+HANDLER = cross_search.CrossSearchHandler() if cross_search else None
+
+
+@functools.lru_cache(maxsize=8)
+def read_text(path):
+    """Read a file once and share the contents across tests."""
+    return Path(path).read_text()
+
+
+@functools.lru_cache(maxsize=128)
+def urls_for(query, engines=()):
+    """Memoized URL generation; the handler is pure w.r.t. its input."""
+    return tuple(HANDLER.generate_search_urls(
+        query, list(engines) if engines else None))
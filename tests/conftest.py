@@ -6,6 +6,7 @@
 
 import os
 import pathlib
+import socket
 import sys
 import ssl
 
@@ -227,6 +228,21 @@ def pytest_ignore_collect(collection_path: pathlib.Path) -> bool:
     return rel_path == pathlib.Path('end2end') / 'features' and skip_bdd
 
 
+@pytest.fixture(scope='session')
+def network_available() -> bool:
+    """Whether outbound network access is available.
+
+    One cheap probe of a public DNS port per session, so that offline
+    runs can skip network-dependent tests immediately instead of each
+    test waiting out its own socket timeout.
+    """
+    try:
+        socket.create_connection(('1.1.1.1', 53), timeout=0.5).close()
+        return True
+    except OSError:
+        return False
+
+
 @pytest.fixture(scope='session')
 def qapp_args() -> list[str]:
     """Work around various issues when running QtWebEngine tests."""
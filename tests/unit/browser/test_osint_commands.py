@@ -5,7 +5,7 @@
 """Tests for OSINT commands."""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 from qutebrowser.qt.core import QUrl
 
 from qutebrowser.browser import osint_commands
@@ -16,21 +16,31 @@ from qutebrowser.api import cmdutils
 class TestOSINTCommands:
     """Test OSINT command functionality."""
 
-    @pytest.fixture
-    def osint_cmd(self, qtbot, config_stub):
-        """Create an OSINTCommands instance for testing."""
+    @pytest.fixture(scope='class')
+    def _osint_cmd_base(self):
+        """Build the mocked browser and command instance once per class.
+
+        OSINTCommands holds no per-test state itself, so constructing
+        it (and the Mock tabbed browser) for every test only burns
+        setup time.
+        """
         tabbed_browser = Mock()
         tabbed_browser.tabopen = Mock()
         tabbed_browser.current_url = Mock(return_value=QUrl("https://example.com/page"))
-        
+        return osint_commands.OSINTCommands(0, tabbed_browser)
+
+    @pytest.fixture
+    def osint_cmd(self, _osint_cmd_base, config_stub):
+        """Reset the shared instance's mocks and config for each test."""
+        _osint_cmd_base._tabbed_browser.reset_mock()
+
         config_stub.val.osint.open_tabs_background = True
         config_stub.val.osint.max_tabs_per_search = 10
         config_stub.val.osint.trade_data_sources = ['importyeti', 'panjiva']
         config_stub.val.osint.vulnerability_databases = ['nvd', 'mitre']
         config_stub.val.osint.graph_api_endpoint = ""
-        
-        cmd = osint_commands.OSINTCommands(0, tabbed_browser)
-        return cmd
+
+        return _osint_cmd_base
 
     def test_cryptocurrency_forensics(self, osint_cmd):
         """Test cryptocurrency address lookup."""
@@ -101,11 +111,11 @@ class TestOSINTCommands:
         assert any("whatsmyname" in url.lower() for url in urls)
         assert any("namechk" in url.lower() for url in urls)
 
-    @patch('urllib.request.urlopen')
-    def test_export_to_graph_with_endpoint(self, mock_urlopen, osint_cmd, config_stub):
+    def test_export_to_graph_with_endpoint(self, osint_cmd, config_stub, mocker):
         """Test exporting entity to graph database."""
+        mock_urlopen = mocker.patch('urllib.request.urlopen')
         config_stub.val.osint.graph_api_endpoint = "http://localhost:8080/api"
-        
+
         mock_response = Mock()
         mock_response.getcode.return_value = 200
         mock_response.__enter__ = Mock(return_value=mock_response)
@@ -134,11 +144,11 @@ class TestOSINTCommands:
         
         assert "No graph API endpoint configured" in str(exc_info.value)
 
-    @patch('urllib.request.urlopen')
-    def test_query_graph_database(self, mock_urlopen, osint_cmd, config_stub):
+    def test_query_graph_database(self, osint_cmd, config_stub, mocker):
         """Test querying graph database."""
+        mock_urlopen = mocker.patch('urllib.request.urlopen')
         config_stub.val.osint.graph_api_endpoint = "http://localhost:8080/api"
-        
+
         mock_response = Mock()
         mock_response.getcode.return_value = 200
         mock_response.read.return_value = b'{"results": ["test1", "test2"]}'
@@ -6,13 +6,31 @@
 
 import time
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 
 from qutebrowser.qt.core import QUrl
 from qutebrowser.qt.network import QNetworkRequest
 from qutebrowser.browser import privacy
 
 
+# Mock(spec=cls) walks the whole class on every instantiation to build
+# its attribute restriction set - expensive for Qt classes with
+# hundreds of methods. Enumerate each interface once at import and
+# hand Mock the cached name list instead.
+_QNETREQ_ATTRS = dir(QNetworkRequest)
+_QURL_ATTRS = dir(QUrl)
+
+
+def _mock_request():
+    """Get a fresh Mock restricted to the QNetworkRequest interface."""
+    return Mock(spec=_QNETREQ_ATTRS)
+
+
+def _mock_url():
+    """Get a fresh Mock restricted to the QUrl interface."""
+    return Mock(spec=_QURL_ATTRS)
+
+
 class TestTimestampObfuscator:
     """Tests for TimestampObfuscator class."""
     
@@ -122,7 +140,7 @@ class TestHeaderSanitizer:
     def test_sanitize_request_when_disabled(self):
         """Test that request is unchanged when disabled."""
         sanitizer = privacy.HeaderSanitizer()
-        request = Mock(spec=QNetworkRequest)
+        request = _mock_request()
         
         result = sanitizer.sanitize_request(request)
         assert result == request
@@ -133,7 +151,7 @@ class TestHeaderSanitizer:
         sanitizer = privacy.HeaderSanitizer()
         sanitizer.enable(True)
         
-        request = Mock(spec=QNetworkRequest)
+        request = _mock_request()
         request.rawHeader.return_value = b''
         
         sanitizer.sanitize_request(request)
@@ -142,27 +160,27 @@ class TestHeaderSanitizer:
         for header in privacy.HeaderSanitizer.TRACKING_HEADERS:
             request.setRawHeader.assert_any_call(header.encode(), b'')
             
-    def test_sanitize_referrer(self):
+    def test_sanitize_referrer(self, mocker):
         """Test referrer sanitization."""
         sanitizer = privacy.HeaderSanitizer()
         sanitizer.enable(True)
         sanitizer._sanitize_referrer = True
-        
-        request = Mock(spec=QNetworkRequest)
+
+        request = _mock_request()
         # Mock rawHeader to return a Mock with data() method
         mock_header = Mock()
         mock_header.data.return_value = b'http://example.com/path/to/page'
         request.rawHeader.return_value = mock_header
-        
-        with patch('qutebrowser.browser.privacy.QUrl') as mock_qurl:
-            mock_url = Mock()
-            mock_url.scheme.return_value = 'http'
-            mock_url.host.return_value = 'example.com'
-            mock_url.port.return_value = -1
-            mock_qurl.return_value = mock_url
-            
-            sanitizer.sanitize_request(request)
-            request.setRawHeader.assert_any_call(b'Referer', b'http://example.com')
+
+        mock_qurl = mocker.patch('qutebrowser.browser.privacy.QUrl')
+        mock_url = Mock()
+        mock_url.scheme.return_value = 'http'
+        mock_url.host.return_value = 'example.com'
+        mock_url.port.return_value = -1
+        mock_qurl.return_value = mock_url
+
+        sanitizer.sanitize_request(request)
+        request.setRawHeader.assert_any_call(b'Referer', b'http://example.com')
 
 
 class TestFingerprintProtection:
@@ -176,24 +194,17 @@ class TestFingerprintProtection:
         assert fp._font_enumeration_blocked is False
         assert fp._screen_resolution_spoofed is False
         
-    def test_enable_canvas_protection(self):
-        """Test enabling canvas protection."""
-        fp = privacy.FingerprintProtection()
-        fp.enable_canvas_protection(True)
-        assert fp._canvas_noise_enabled is True
-        
-    def test_enable_webgl_protection(self):
-        """Test enabling WebGL protection."""
+    @pytest.mark.parametrize('method, attr', [
+        ('enable_canvas_protection', '_canvas_noise_enabled'),
+        ('enable_webgl_protection', '_webgl_protection_enabled'),
+        ('enable_font_blocking', '_font_enumeration_blocked'),
+    ])
+    def test_enable(self, method, attr):
+        """Test enabling individual fingerprint protections."""
         fp = privacy.FingerprintProtection()
-        fp.enable_webgl_protection(True)
-        assert fp._webgl_protection_enabled is True
-        
-    def test_enable_font_blocking(self):
-        """Test enabling font blocking."""
-        fp = privacy.FingerprintProtection()
-        fp.enable_font_blocking(True)
-        assert fp._font_enumeration_blocked is True
-        
+        getattr(fp, method)(True)
+        assert getattr(fp, attr) is True
+
     def test_enable_resolution_spoofing(self):
         """Test enabling resolution spoofing."""
         fp = privacy.FingerprintProtection()
@@ -207,60 +218,47 @@ class TestFingerprintProtection:
         script = fp.get_protection_script()
         assert script == ''
         
-    def test_get_protection_script_with_canvas(self):
-        """Test script generation with canvas protection."""
-        fp = privacy.FingerprintProtection()
-        fp.enable_canvas_protection(True)
-        script = fp.get_protection_script()
-        assert 'HTMLCanvasElement.prototype.toDataURL' in script
-        assert 'addNoise' in script
-        
-    def test_get_protection_script_with_webgl(self):
-        """Test script generation with WebGL protection."""
+    @pytest.mark.parametrize('method, expected', [
+        ('enable_canvas_protection',
+         ['HTMLCanvasElement.prototype.toDataURL', 'addNoise']),
+        ('enable_webgl_protection',
+         ['WebGLRenderingContext.prototype.getParameter', 'Intel Inc.']),
+        ('enable_font_blocking', ['offsetWidth', 'fontFamily']),
+        ('enable_resolution_spoofing',
+         ['window.screen', '1920']),  # 1920: default resolution
+    ])
+    def test_get_protection_script(self, method, expected):
+        """Test script generation with a single protection enabled."""
         fp = privacy.FingerprintProtection()
-        fp.enable_webgl_protection(True)
+        getattr(fp, method)(True)
         script = fp.get_protection_script()
-        assert 'WebGLRenderingContext.prototype.getParameter' in script
-        assert 'Intel Inc.' in script
-        
-    def test_get_protection_script_with_fonts(self):
-        """Test script generation with font blocking."""
-        fp = privacy.FingerprintProtection()
-        fp.enable_font_blocking(True)
-        script = fp.get_protection_script()
-        assert 'offsetWidth' in script
-        assert 'fontFamily' in script
-        
-    def test_get_protection_script_with_resolution(self):
-        """Test script generation with resolution spoofing."""
-        fp = privacy.FingerprintProtection()
-        fp.enable_resolution_spoofing(True)
-        script = fp.get_protection_script()
-        assert 'window.screen' in script
-        assert '1920' in script  # Default resolution
+        for fragment in expected:
+            assert fragment in script
 
 
 class TestCookieManager:
     """Tests for CookieManager class."""
-    
-    def test_disabled_by_default(self):
+
+    @pytest.fixture
+    def manager(self):
+        """Create a CookieManager instance."""
+        return privacy.CookieManager()
+
+    def test_disabled_by_default(self, manager):
         """Test that cookie features are disabled by default."""
-        manager = privacy.CookieManager()
         assert manager._compartmentalized is False
         assert manager._auto_delete_enabled is False
         assert manager._first_party_isolation is False
-        
-    def test_store_and_retrieve_cookie(self):
+
+    def test_store_and_retrieve_cookie(self, manager):
         """Test storing and retrieving cookies."""
-        manager = privacy.CookieManager()
         manager.store_cookie('example.com', 'session', 'abc123')
-        
+
         cookies = manager.get_cookies('example.com')
         assert cookies == {'session': 'abc123'}
-        
-    def test_first_party_isolation(self):
+
+    def test_first_party_isolation(self, manager):
         """Test first-party isolation."""
-        manager = privacy.CookieManager()
         manager.enable_first_party_isolation(True)
         
         manager.store_cookie('tracker.com', 'id', '123', first_party='site1.com')
@@ -272,9 +270,8 @@ class TestCookieManager:
         assert cookies1 == {'id': '123'}
         assert cookies2 == {'id': '456'}
         
-    def test_delete_cookies_for_domain(self):
+    def test_delete_cookies_for_domain(self, manager):
         """Test deleting cookies for a specific domain."""
-        manager = privacy.CookieManager()
         manager.store_cookie('example.com', 'session', 'abc123')
         manager.store_cookie('other.com', 'session', 'xyz789')
         
@@ -283,9 +280,8 @@ class TestCookieManager:
         assert manager.get_cookies('example.com') == {}
         assert manager.get_cookies('other.com') == {'session': 'xyz789'}
         
-    def test_clear_all_cookies(self):
+    def test_clear_all_cookies(self, manager):
         """Test clearing all cookies."""
-        manager = privacy.CookieManager()
         manager.store_cookie('example.com', 'session', 'abc123')
         manager.store_cookie('other.com', 'session', 'xyz789')
         
@@ -317,24 +313,26 @@ class TestNetworkSecurity:
         ns = privacy.NetworkSecurity()
         ns.enable_https_upgrade(True)
         
-        url = Mock(spec=QUrl)
+        url = _mock_url()
         url.scheme.return_value = 'http'
         assert ns.should_upgrade_to_https(url) is True
         
         url.scheme.return_value = 'https'
         assert ns.should_upgrade_to_https(url) is False
         
-    def test_analyze_request_pattern(self):
+    def test_analyze_request_pattern(self, mocker):
         """Test request pattern analysis."""
         ns = privacy.NetworkSecurity()
         ns.enable_pattern_analysis(True)
-        
-        # Simulate many requests to same domain
+
+        # Simulate many requests to same domain; install the patch
+        # once instead of re-entering it on every iteration.
+        mock_qurl = mocker.patch('qutebrowser.qt.core.QUrl')
+        mock_qurl.return_value.host.return_value = 'suspicious.com'
         for i in range(51):
-            with patch('qutebrowser.qt.core.QUrl') as mock_qurl:
-                mock_qurl.return_value.host.return_value = 'suspicious.com'
-                warning = ns.analyze_request_pattern(f'http://suspicious.com/{i}', time.time())
-                
+            warning = ns.analyze_request_pattern(
+                f'http://suspicious.com/{i}', time.time())
+
         assert warning is not None
         assert 'Suspicious activity detected' in warning
         assert '51 requests' in warning
@@ -394,30 +392,31 @@ class TestPrivacyManager:
         """Test that privacy manager is disabled by default."""
         assert manager._enabled is False
         
-    def test_enable(self, manager):
+    def test_enable(self, manager, mocker):
         """Test enabling privacy manager."""
-        with patch('qutebrowser.browser.privacy.config.val.privacy') as mock_config:
-            # Set all config values to True
-            mock_config.timestamp_obfuscation = True
-            mock_config.user_agent_rotation = True
-            mock_config.header_sanitization = True
-            mock_config.canvas_protection = True
-            mock_config.webgl_protection = True
-            mock_config.font_blocking = True
-            mock_config.resolution_spoofing = True
-            mock_config.cookie_compartmentalization = True
-            mock_config.cookie_auto_delete = True
-            mock_config.first_party_isolation = True
-            mock_config.dns_over_https = True
-            mock_config.https_upgrade = True
-            mock_config.request_pattern_analysis = True
-            mock_config.js_sandbox_enhanced = True
-            mock_config.webrtc_protection = True
-            
-            manager.enable(True)
-            assert manager._enabled is True
-            assert manager.timestamp_obfuscator._enabled is True
-            assert manager.user_agent_rotator._rotation_enabled is True
+        mock_config = mocker.patch(
+            'qutebrowser.browser.privacy.config.val.privacy')
+        # Set all config values to True
+        mock_config.timestamp_obfuscation = True
+        mock_config.user_agent_rotation = True
+        mock_config.header_sanitization = True
+        mock_config.canvas_protection = True
+        mock_config.webgl_protection = True
+        mock_config.font_blocking = True
+        mock_config.resolution_spoofing = True
+        mock_config.cookie_compartmentalization = True
+        mock_config.cookie_auto_delete = True
+        mock_config.first_party_isolation = True
+        mock_config.dns_over_https = True
+        mock_config.https_upgrade = True
+        mock_config.request_pattern_analysis = True
+        mock_config.js_sandbox_enhanced = True
+        mock_config.webrtc_protection = True
+
+        manager.enable(True)
+        assert manager._enabled is True
+        assert manager.timestamp_obfuscator._enabled is True
+        assert manager.user_agent_rotator._rotation_enabled is True
             
     def test_process_request(self, manager):
         """Test processing a network request."""
@@ -425,8 +424,8 @@ class TestPrivacyManager:
         manager.header_sanitizer.enable(True)
         manager.user_agent_rotator.enable_rotation(True)
         
-        request = Mock(spec=QNetworkRequest)
-        url = Mock(spec=QUrl)
+        request = _mock_request()
+        url = _mock_url()
         url.host.return_value = 'example.com'
         url.toString.return_value = 'http://example.com'
         request.url.return_value = url
@@ -460,9 +459,9 @@ class TestPrivacyManager:
         assert status['timestamp_obfuscation'] is True
 
 
-def test_init():
+def test_init(mocker):
     """Test privacy manager initialization."""
-    with patch('qutebrowser.browser.privacy.objreg.register') as mock_register:
-        manager = privacy.init()
-        assert isinstance(manager, privacy.PrivacyManager)
-        mock_register.assert_called_once_with('privacy-manager', manager)
\ No newline at end of file
+    mock_register = mocker.patch('qutebrowser.browser.privacy.objreg.register')
+    manager = privacy.init()
+    assert isinstance(manager, privacy.PrivacyManager)
+    mock_register.assert_called_once_with('privacy-manager', manager)
\ No newline at end of file
@@ -148,7 +148,8 @@ def main():
             # Add detailed results
             html += """
                 <h2>Detailed Results</h2>
-                <pre>""" + json.dumps(results, indent=2) + """</pre>
+                <pre>""" + json.dumps(results, indent=2,
+                                       default=lambda m: m.to_dict()) + """</pre>
                 
                 <hr>
                 <p><small>Search completed at """ + os.popen('date').read().strip() + """</small></p>